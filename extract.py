@@ -1,19 +1,64 @@
 import os
+import argparse
 from rfp_extractor.extractor import batch_extract
 from rfp_extractor.llm_client import get_llm_client
+from rfp_extractor.sharding import parse_shard
+from rfp_extractor.watch import watch_extract
+
+def shard_arg(spec: str):
+    try:
+        return parse_shard(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def positive_float(value: str) -> float:
+    try:
+        f = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}")
+    if f <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value!r}")
+    return f
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Extract structured RFP data from PDF/HTML documents.")
+    ap.add_argument("--shard", type=shard_arg, default=os.environ.get("RFP_SHARD"),
+                    help="Only process shard i of N (0-based), e.g. --shard 0/4")
+    ap.add_argument("--lease", action="store_true",
+                    default=os.environ.get("RFP_LEASE", "false").lower() in ("1", "true", "yes"),
+                    help="Claim files through lease files so several workers can share one input directory")
+    ap.add_argument("--lease-ttl", type=positive_float, default=os.environ.get("RFP_LEASE_TTL", "600"),
+                    help="Seconds without a heartbeat before another worker may take over a lease")
+    ap.add_argument("--worker-id", default=os.environ.get("RFP_WORKER_ID"),
+                    help="Name recorded in lease files (default: hostname-pid)")
+    ap.add_argument("--watch", action="store_true",
+                    help="Keep running and extract new documents as they arrive in RFP_INPUT_DIR")
+    ap.add_argument("--poll-interval", type=positive_float, default=os.environ.get("RFP_POLL_INTERVAL", "1"),
+                    help="Seconds between directory scans in --watch mode")
+    ap.add_argument("--settle", type=positive_float, default=os.environ.get("RFP_SETTLE", "2"),
+                    help="Seconds a file must stay unchanged before it is extracted in --watch mode")
+    return ap.parse_args()
 
 def main():
+    args = parse_args()
     INPUT_DIR = os.environ.get("RFP_INPUT_DIR", "data")
     OUTPUT_DIR = os.environ.get("RFP_OUTPUT_DIR", "outputs")
     OCR_IF_EMPTY = os.environ.get("ENABLE_OCR", "true").lower() in ("1", "true", "yes")
-    
+    shard = args.shard
+
     llm = get_llm_client()
     print(f"[main] Using LLM provider: {os.environ.get('LLM_PROVIDER')}, LLM client: {type(llm).__name__ if llm else 'None'}")
-    batch_extract(INPUT_DIR, OUTPUT_DIR, llm_client=llm, ocr_if_empty=OCR_IF_EMPTY)
+    if args.watch:
+        try:
+            watch_extract(INPUT_DIR, OUTPUT_DIR, llm_client=llm, ocr_if_empty=OCR_IF_EMPTY,
+                          poll_interval=args.poll_interval, settle=args.settle, shard=shard,
+                          lease=args.lease, lease_ttl=args.lease_ttl, worker_id=args.worker_id)
+        except KeyboardInterrupt:
+            print("[main] Watch stopped.")
+        return
+    batch_extract(INPUT_DIR, OUTPUT_DIR, llm_client=llm, ocr_if_empty=OCR_IF_EMPTY,
+                  shard=shard, lease=args.lease, lease_ttl=args.lease_ttl, worker_id=args.worker_id)
     print(f"[main] Extraction done. JSON outputs in {OUTPUT_DIR}")
 
 if __name__ == "__main__":
     main()
-
-
-
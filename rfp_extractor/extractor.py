@@ -1,10 +1,12 @@
 import os
 import json
-from typing import Dict, Any
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from .pdf_extract import extract_pdf_text
 from .html_extract import extract_html_text
 from .llm_client import get_llm_client
 from .utils import rule_based_extract, safe_extract_json, clean_and_validate
+from .sharding import in_shard, atomic_write_json, default_worker_id, FileLease
 from tqdm import tqdm
 
 def build_prompt(doc_text: str) -> str:
@@ -83,21 +85,92 @@ def extract_from_file(path: str, llm_client=None, ocr_if_empty=True) -> Dict[str
     cleaned = clean_and_validate(merged, text)
     return cleaned
 
-def batch_extract(input_dir: str, output_dir: str, llm_client=None, ocr_if_empty=True):
-    os.makedirs(output_dir, exist_ok=True)
-    files = [os.path.join(input_dir, f) for f in os.listdir(input_dir)
-             if f.lower().endswith((".pdf", ".html", ".htm", ".txt"))]
-    for f in tqdm(files, desc="Processing files"):
-        try:
-            res = extract_from_file(f, llm_client=llm_client, ocr_if_empty=ocr_if_empty)
-            out_path = os.path.join(output_dir, os.path.splitext(os.path.basename(f))[0] + ".json")
-            with open(out_path, "w", encoding="utf-8") as fw:
-                json.dump(res, fw, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"[batch_extract] Failed on {f}: {e}")
- 
-     
+def output_path_for(path: str, output_dir: str) -> str:
+    return os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0] + ".json")
+
+def list_input_files(input_dir: str) -> List[str]:
+    return sorted(os.path.join(input_dir, f) for f in os.listdir(input_dir)
+                  if f.lower().endswith((".pdf", ".html", ".htm", ".txt")))
+
+def _is_fresh(marker: str, source: str) -> bool:
+    try:
+        return os.path.getmtime(marker) >= os.path.getmtime(source)
+    except OSError:
+        return False
+
+def lease_dir_for(output_dir: str) -> str:
+    return os.path.join(output_dir, ".leases")
 
+def _failed_marker(path: str, output_dir: str) -> str:
+    return os.path.join(lease_dir_for(output_dir), os.path.basename(path) + ".failed")
 
+def has_output(path: str, output_dir: str) -> bool:
+    return _is_fresh(output_path_for(path, output_dir), path)
+
+def is_finished(path: str, output_dir: str) -> bool:
+    """True if `path` already has an output, or a failure marker, newer than the file itself."""
+    return has_output(path, output_dir) or _is_fresh(_failed_marker(path, output_dir), path)
+
+def mark_failed(path: str, output_dir: str, worker_id: str, error: Exception):
+    atomic_write_json(_failed_marker(path, output_dir), {"worker": worker_id, "error": str(error)})
+
+def batch_extract(input_dir: str, output_dir: str, llm_client=None, ocr_if_empty=True,
+                  shard: Optional[Tuple[int, int]] = None, lease: bool = False,
+                  lease_ttl: float = 600.0, worker_id: Optional[str] = None):
+    """Extract every supported file in `input_dir` into `output_dir`.
+
+    `shard=(i, N)` restricts this process to the files that hash into shard i.
+    With `lease=True` files are instead claimed one at a time through lease
+    files in `<output_dir>/.leases`, so any number of workers can share the
+    directory and files held by a crashed worker are retried after
+    `lease_ttl` seconds. Both can be combined.
+    """
+    if lease and lease_ttl <= 0:
+        raise ValueError(f"lease_ttl must be positive, got {lease_ttl}")
+    os.makedirs(output_dir, exist_ok=True)
+    files = list_input_files(input_dir)
+    if shard:
+        files = [f for f in files if in_shard(f, *shard)]
+    if not lease:
+        for f in tqdm(files, desc="Processing files"):
+            try:
+                res = extract_from_file(f, llm_client=llm_client, ocr_if_empty=ocr_if_empty)
+                atomic_write_json(output_path_for(f, output_dir), res)
+            except Exception as e:
+                print(f"[batch_extract] Failed on {f}: {e}")
+        return
 
+    worker_id = worker_id or default_worker_id()
+    lease_dir = lease_dir_for(output_dir)
+    os.makedirs(lease_dir, exist_ok=True)
 
+    pbar = tqdm(total=len(files), desc=f"Processing files [{worker_id}]")
+    pending = list(files)
+    while pending:
+        progressed = False
+        waiting = []
+        for f in pending:
+            if is_finished(f, output_dir):
+                pbar.update(1)
+                continue
+            fl = FileLease(lease_dir, os.path.basename(f), worker_id, lease_ttl)
+            if not fl.acquire():
+                waiting.append(f)
+                continue
+            progressed = True
+            try:
+                if is_finished(f, output_dir):
+                    continue
+                res = extract_from_file(f, llm_client=llm_client, ocr_if_empty=ocr_if_empty)
+                atomic_write_json(output_path_for(f, output_dir), res)
+            except Exception as e:
+                print(f"[batch_extract] Failed on {f}: {e}")
+                mark_failed(f, output_dir, worker_id, e)
+            finally:
+                fl.release()
+                pbar.update(1)
+        pending = waiting
+        if pending and not progressed:
+            # Everything left is leased by other workers; wait for them to finish or expire.
+            time.sleep(min(5.0, lease_ttl / 4.0))
+    pbar.close()
@@ -0,0 +1,155 @@
+import os
+import re
+import json
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple, Iterable
+
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gazetteer.json")
+
+Match = Tuple[int, int, str, str]
+
+class Gazetteer:
+    """Aho-Corasick matcher over known organization names.
+
+    `entries` maps a category ("buyer", "cooperative", ...) to
+    {canonical name: [aliases]}; the canonical name itself is only matched
+    when it has no aliases. Multi-word aliases match case-insensitively
+    with any run of whitespace treated as a single space; single-word aliases
+    (Dell, BuyBoard, NASPO) must match exactly as written so they do not fire
+    on ordinary lowercase words.
+    """
+
+    def __init__(self, entries: Dict[str, Dict[str, List[str]]]):
+        self.entries = entries
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str, str, Optional[str]]]] = [[]]
+        for category, names in entries.items():
+            for canonical, aliases in (names or {}).items():
+                for alias in set(aliases or [canonical]):
+                    self._add(alias, category, canonical)
+        self._build()
+
+    def _add(self, alias: str, category: str, canonical: str):
+        key = re.sub(r"\s+", " ", alias).strip()
+        if not key:
+            return
+        exact = key if " " not in key else None
+        node = 0
+        for ch in key.lower():
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(key), category, canonical, exact))
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text: str) -> List[Match]:
+        """Return (start, end, category, canonical) for every whole-word match, in one pass."""
+        found: List[Match] = []
+        if not text or not isinstance(text, str):
+            return found
+        goto, fail, out = self._goto, self._fail, self._out
+        positions: List[int] = []
+        node = 0
+        prev_space = True
+        for i, ch in enumerate(text):
+            if ch.isspace():
+                if prev_space:
+                    continue
+                ch = " "
+                prev_space = True
+            else:
+                prev_space = False
+            positions.append(i)
+            ch = ch.lower()
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            n = len(positions)
+            for length, category, canonical, exact in out[node]:
+                start = positions[n - length]
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if i + 1 < len(text) and text[i + 1].isalnum():
+                    continue
+                if exact and re.sub(r"\s+", " ", text[start:i + 1]) != exact:
+                    continue
+                found.append((start, i + 1, category, canonical))
+        found.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        return found
+
+    def first(self, text: str, categories: Iterable[str], matches: Optional[List[Match]] = None) -> Optional[str]:
+        """Earliest canonical name in `text`, trying `categories` in priority order."""
+        if matches is None:
+            matches = self.find_all(text)
+        for category in categories:
+            for _, _, cat, canonical in matches:
+                if cat == category:
+                    return canonical
+        return None
+
+_cache: Dict[str, Tuple[float, Gazetteer]] = {}
+
+def validate_entries(raw: Any, path: str = "<gazetteer>") -> Dict[str, Dict[str, List[str]]]:
+    """Keep only well-formed {category: {canonical: [aliases]}} entries, logging the rest."""
+    if not isinstance(raw, dict):
+        print(f"[gazetteer] {path}: top level must be an object of categories, got {type(raw).__name__}")
+        return {}
+    entries: Dict[str, Dict[str, List[str]]] = {}
+    for category, names in raw.items():
+        if not isinstance(names, dict):
+            print(f"[gazetteer] {path}: category {category!r} must map canonical names to alias lists; skipped")
+            continue
+        good: Dict[str, List[str]] = {}
+        for canonical, aliases in names.items():
+            if aliases is None:
+                aliases = []
+            if not isinstance(aliases, list) or not all(isinstance(a, str) for a in aliases):
+                print(f"[gazetteer] {path}: aliases for {category}/{canonical!r} must be a list of strings; skipped")
+                continue
+            good[canonical] = aliases
+        entries[category] = good
+    return entries
+
+def load_gazetteer(path: Optional[str] = None) -> Gazetteer:
+    """Load (and cache) the gazetteer; edits to the JSON file are picked up on next call."""
+    path = path or os.environ.get("RFP_GAZETTEER") or DEFAULT_GAZETTEER_PATH
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = -1.0
+    cached = _cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    if mtime < 0:
+        print(f"[gazetteer] Gazetteer file not found: {path}. Falling back to regex only.")
+        gz = Gazetteer({})
+    else:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                gz = Gazetteer(validate_entries(json.load(f), path))
+        except Exception as e:
+            # Keep matching with the last good copy rather than failing every extraction.
+            print(f"[gazetteer] Failed to load {path}: {e}")
+            gz = cached[1] if cached else Gazetteer({})
+    _cache[path] = (mtime, gz)
+    return gz
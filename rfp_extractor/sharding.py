@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import uuid
+import socket
+import hashlib
+import tempfile
+import threading
+from typing import Any, Optional, Tuple
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse an `i/N` shard spec (0-based index, N shards)."""
+    try:
+        idx, count = (int(p) for p in spec.split("/", 1))
+    except Exception:
+        raise ValueError(f"Invalid shard spec {spec!r}; expected i/N, e.g. 0/4")
+    if count < 1 or not 0 <= idx < count:
+        raise ValueError(f"Invalid shard spec {spec!r}; need 0 <= i < N")
+    return idx, count
+
+def in_shard(path: str, idx: int, count: int) -> bool:
+    # Hash the basename so nodes agree even when the share is mounted at different paths.
+    h = hashlib.sha1(os.path.basename(path).encode("utf-8")).hexdigest()
+    return int(h[:12], 16) % count == idx
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+# Read once at import: os.umask can only be queried by setting it, which is not thread-safe.
+_UMASK = _current_umask()
+
+def atomic_write_json(path: str, obj: Any):
+    d = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=d, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fw:
+            json.dump(obj, fw, indent=2, ensure_ascii=False)
+            fw.flush()
+            os.fsync(fw.fileno())
+        # mkstemp creates 0600; give the output the permissions a plain open() would.
+        os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def _age(path: str) -> Optional[float]:
+    try:
+        return time.time() - os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+def _token_of(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("token")
+    except Exception:
+        return None
+
+def _break_stale(path: str, ttl: float) -> bool:
+    """Atomically remove `path` if it is older than `ttl`; True if it is gone afterwards.
+
+    The file is renamed to a unique name first, so of several workers that saw
+    it as stale only one can take it. If the file we grabbed turns out to be
+    fresh (someone replaced it after our check), it is linked back in place.
+    """
+    age = _age(path)
+    if age is None:
+        return True
+    if age <= ttl:
+        return False
+    grave = f"{path}.{uuid.uuid4().hex}.stale"
+    try:
+        os.rename(path, grave)
+    except FileNotFoundError:
+        return False
+    grabbed_age = _age(grave)
+    gone = grabbed_age is not None and grabbed_age > ttl
+    if not gone:
+        try:
+            os.link(grave, path)
+        except OSError:
+            pass
+    try:
+        os.remove(grave)
+    except FileNotFoundError:
+        pass
+    return gone
+
+class FileLease:
+    """Exclusive, expiring claim on one input file, held as `<lease_dir>/<name>.lease`.
+
+    Leases are created with O_EXCL and kept fresh by a heartbeat thread that
+    touches the file every ttl/3 seconds. A lease whose mtime is older than
+    `ttl` belongs to a dead worker and may be taken over; takeovers are
+    serialized through a `.steal` lock and stale files are only ever removed
+    by an atomic rename, so two workers cannot both win.
+    Node clocks should agree to well within `ttl`.
+    """
+
+    def __init__(self, lease_dir: str, name: str, worker_id: str, ttl: float):
+        if ttl <= 0:
+            raise ValueError(f"Lease TTL must be positive, got {ttl}")
+        self.path = os.path.join(lease_dir, name + ".lease")
+        self.worker_id = worker_id
+        self.ttl = ttl
+        self.token = f"{worker_id}:{uuid.uuid4().hex}"
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _create(self, path: Optional[str] = None) -> bool:
+        try:
+            fd = os.open(path or self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"token": self.token, "worker": self.worker_id, "acquired": time.time()}, f)
+        return True
+
+    def _steal(self) -> bool:
+        lock = self.path + ".steal"
+        _break_stale(lock, self.ttl)
+        if not self._create(lock):
+            return False
+        try:
+            if _token_of(lock) != self.token:
+                return False
+            if not _break_stale(self.path, self.ttl):
+                return False
+            return self._create()
+        finally:
+            if _token_of(lock) == self.token:
+                try:
+                    os.remove(lock)
+                except FileNotFoundError:
+                    pass
+
+    def acquire(self) -> bool:
+        if not (self._create() or self._steal()):
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._heartbeat, daemon=True)
+        self._thread.start()
+        return True
+
+    def _heartbeat(self):
+        while not self._stop.wait(self.ttl / 3.0):
+            try:
+                os.utime(self.path, None)
+            except OSError:
+                return
+
+    def owned(self) -> bool:
+        return _token_of(self.path) == self.token
+
+    def release(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self.owned():
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
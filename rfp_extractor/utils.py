@@ -2,6 +2,7 @@ import re
 import json
 from dateutil import parser as date_parser
 from typing import Optional, Dict, Any, List
+from .gazetteer import load_gazetteer
 
 SCHEMA_FIELDS = [
     "bid_number", "title", "due_date", "bid_submission_type", "term_of_bid",
@@ -157,7 +158,13 @@ def looks_like_value(val: Optional[str]) -> bool:
         return True
     return False
 
-def extract_contact_and_company(text: str) -> Dict[str, Optional[str]]:
+def _vendor_in_span(entities: List, start: int, end: int) -> Optional[str]:
+    for s, e, category, canonical in entities:
+        if category == "vendor" and s >= start and e <= end:
+            return canonical
+    return None
+
+def extract_contact_and_company(text: str, entities: Optional[List] = None) -> Dict[str, Optional[str]]:
     contact = {"contact_name": None, "email": None, "phone": None, "company_name": None}
     if not text or not isinstance(text, str):
         return contact
@@ -172,17 +179,19 @@ def extract_contact_and_company(text: str) -> Dict[str, Optional[str]]:
     if phone and not is_junk_token(phone):
         contact["phone"] = phone
 
-    org_priority_rx = [
-        r"\b(Dallas\s+Independent\s+School\s+District|Dallas\s+ISD)\b",
-        r"\b([A-Z][A-Za-z0-9&,\.\- ]{2,120}\b(?:Independent School District|ISD|District|Inc|LLC|Ltd|Co\.|Company|Corporation|Corp|University|College|Authority))\b"
-    ]
-    for rx in org_priority_rx:
-        m = re.search(rx, text, re.IGNORECASE)
+    gz = load_gazetteer()
+    if entities is None:
+        entities = gz.find_all(text)
+    contact["company_name"] = gz.first(text, ["buyer"], matches=entities)
+
+    if not contact["company_name"]:
+        org_rx = r"\b([A-Z][A-Za-z0-9&,\.\- ]{2,120}\b(?:Independent School District|ISD|District|Inc|LLC|Ltd|Co\.|Company|Corporation|Corp|University|College|Authority))\b"
+        m = re.search(org_rx, text, re.IGNORECASE)
         if m:
             cand = m.group(0).strip()
             if len(cand.split()) <= 10 and "?" not in cand and not re.search(r"\b(does|do|is|are|will|can)\b", cand.lower()):
-                contact["company_name"] = cand
-                break
+                # Trim run-on matches like "... with Dell Financial Services LLC" to the known vendor.
+                contact["company_name"] = _vendor_in_span(entities, m.start(), m.end()) or cand
 
     if not contact["company_name"]:
         lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
@@ -208,6 +217,9 @@ def extract_contact_and_company(text: str) -> Dict[str, Optional[str]]:
                     contact["company_name"] = cand.strip()
                     break
 
+    if not contact["company_name"]:
+        contact["company_name"] = gz.first(text, ["vendor"], matches=entities)
+
     if contact["company_name"] and is_junk_phrase(contact["company_name"]):
         contact["company_name"] = None
 
@@ -388,7 +400,12 @@ def rule_based_extract(text: str) -> Dict[str, Any]:
     header_lines = "\n".join([ln.strip() for ln in text.splitlines()[:10] if ln.strip()])
     out["bid_summary"] = (header_lines[:800] + "...") if header_lines else None
 
-    c = extract_contact_and_company(text)
+    gz = load_gazetteer()
+    entities = gz.find_all(text)
+    out["contract_or_cooperative_to_use"] = gz.first(text, ["cooperative"], matches=entities)
+    out["mfg_for_registration"] = gz.first(text, ["manufacturer"], matches=entities)
+
+    c = extract_contact_and_company(text, entities=entities)
     out["contact_info"] = c
     out["company_name"] = c.get("company_name")
 
@@ -422,11 +439,16 @@ def clean_and_validate(extracted: Dict[str, Any], original_text: str) -> Dict[st
     cn = out.get("company_name")
     if cn and isinstance(cn, str):
         if "?" in cn or re.search(r"\b(does|do|is|are|will|can|relating|relate|regarding|does)\b", cn.lower()):
-            m = re.search(r"\b(Dallas\s+Independent\s+School\s+District|Dallas\s+ISD|[A-Z][A-Za-z0-9&,\.\- ]{2,80}\b(?:Inc|LLC|Ltd|Co\.|Company|Corporation|Corp|District|ISD|University|College))\b", original_text, re.IGNORECASE)
-            if m:
-                out["company_name"] = m.group(0).strip()
+            gz = load_gazetteer()
+            entities = gz.find_all(original_text)
+            known = gz.first(original_text, ["buyer"], matches=entities)
+            m = None if known else re.search(r"\b([A-Z][A-Za-z0-9&,\.\- ]{2,80}\b(?:Inc|LLC|Ltd|Co\.|Company|Corporation|Corp|District|ISD|University|College))\b", original_text, re.IGNORECASE)
+            if known:
+                out["company_name"] = known
+            elif m:
+                out["company_name"] = _vendor_in_span(entities, m.start(), m.end()) or m.group(0).strip()
             else:
-                out["company_name"] = None
+                out["company_name"] = gz.first(original_text, ["vendor"], matches=entities)
         if out.get("company_name") and re.search(r'\b(i am|i possess|authorized representative|thereby affirm|submitter|submitter’s|i hereby)\b', out["company_name"].lower()):
             out["company_name"] = None
 
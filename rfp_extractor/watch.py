@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from .extractor import (extract_from_file, output_path_for, list_input_files,
+                        lease_dir_for, has_output, is_finished, mark_failed)
+from .sharding import in_shard, atomic_write_json, default_worker_id, FileLease
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _make_waiter(input_dir: str) -> Tuple[Callable[[float], None], Callable[[], None]]:
+    """Return (wait(timeout), close()); wait wakes early on inotify events when inotify_simple is available.
+
+    Only file creation, completed writes and renames into the folder wake it;
+    per-chunk MODIFY events could not trigger an extraction before the settle
+    period anyway. Polling still happens on every timeout, so writes that
+    inotify cannot see (e.g. from other NFS clients) are picked up as well.
+    """
+    try:
+        from inotify_simple import INotify, flags
+        ino = INotify()
+        ino.add_watch(input_dir, flags.CREATE | flags.CLOSE_WRITE | flags.MOVED_TO)
+    except Exception:
+        return time.sleep, lambda: None
+
+    def wait(timeout: float):
+        ino.read(timeout=int(timeout * 1000))
+    return wait, ino.close
+
+def watch_extract(input_dir: str, output_dir: str, llm_client=None, ocr_if_empty=True,
+                  poll_interval: float = 1.0, settle: float = 2.0,
+                  shard: Optional[Tuple[int, int]] = None, lease: bool = False,
+                  lease_ttl: float = 600.0, worker_id: Optional[str] = None,
+                  on_result: Optional[Callable[[str, dict, float], None]] = None,
+                  stop_event: Optional[threading.Event] = None):
+    """Watch `input_dir` and extract each new or changed document as soon as it settles.
+
+    A file is considered complete once its size and mtime have not changed for
+    `settle` seconds. Files that already have an up-to-date output at startup
+    are skipped. A document whose content hash was already extracted is not
+    extracted again; the earlier result is written to its own output instead.
+    Files present at startup are only hashed once a new file of the same size
+    arrives. Each result is written to `output_dir` and passed to
+    `on_result(path, result, latency)`, where latency is the time from first
+    seeing the file to the output being written. `shard`/`lease` behave as in
+    `batch_extract`. Runs until `stop_event` is set (or forever).
+    """
+    if poll_interval <= 0 or settle <= 0:
+        raise ValueError(f"poll_interval and settle must be positive, got {poll_interval} and {settle}")
+    if lease and lease_ttl <= 0:
+        raise ValueError(f"lease_ttl must be positive, got {lease_ttl}")
+    os.makedirs(output_dir, exist_ok=True)
+    worker_id = worker_id or default_worker_id()
+    lease_dir = lease_dir_for(output_dir)
+    if lease:
+        os.makedirs(lease_dir, exist_ok=True)
+    stop_event = stop_event or threading.Event()
+
+    results_by_hash: Dict[str, dict] = {}
+    unhashed_by_size: Dict[int, List[str]] = {}
+    done: Dict[str, Tuple[int, int]] = {}
+    pending: Dict[str, Tuple[int, int, float, float]] = {}
+
+    def cached_result(digest: str, size: int) -> Optional[dict]:
+        # Hash startup files of the same size on demand and reuse their outputs.
+        for p in unhashed_by_size.pop(size, []):
+            try:
+                st = os.stat(p)
+                if done.get(p) != (st.st_size, st.st_mtime_ns) or not has_output(p, output_dir):
+                    continue
+                h = file_sha256(p)
+                with open(output_path_for(p, output_dir), "r", encoding="utf-8") as fr:
+                    results_by_hash.setdefault(h, json.load(fr))
+            except (OSError, ValueError):
+                continue
+        return results_by_hash.get(digest)
+
+    startup = list_input_files(input_dir)
+    if shard:
+        startup = [f for f in startup if in_shard(f, *shard)]
+    for f in startup:
+        if not is_finished(f, output_dir):
+            continue
+        try:
+            st = os.stat(f)
+        except OSError:
+            continue
+        done[f] = (st.st_size, st.st_mtime_ns)
+        unhashed_by_size.setdefault(st.st_size, []).append(f)
+
+    print(f"[watch] Watching {input_dir} ({len(done)} file(s) already extracted)")
+    wait, close = _make_waiter(input_dir)
+    try:
+        while not stop_event.is_set():
+            now = time.time()
+            try:
+                files = list_input_files(input_dir)
+            except OSError as e:
+                print(f"[watch] Cannot list {input_dir}: {e}")
+                files = []
+            if shard:
+                files = [f for f in files if in_shard(f, *shard)]
+
+            for f in files:
+                try:
+                    st = os.stat(f)
+                except FileNotFoundError:
+                    pending.pop(f, None)
+                    continue
+                sig = (st.st_size, st.st_mtime_ns)
+                if done.get(f) == sig:
+                    continue
+                prev = pending.get(f)
+                if prev is None or prev[:2] != sig:
+                    first_seen = prev[2] if prev else now
+                    pending[f] = (sig[0], sig[1], first_seen, now)
+                    continue
+                if sig[0] == 0 or now - prev[3] < settle:
+                    continue
+
+                if is_finished(f, output_dir):
+                    # Another node sharing the directory got to it first.
+                    del pending[f]
+                    done[f] = sig
+                    continue
+                fl = FileLease(lease_dir, os.path.basename(f), worker_id, lease_ttl) if lease else None
+                if fl and not fl.acquire():
+                    continue
+
+                first_seen = prev[2]
+                del pending[f]
+                done[f] = sig
+                try:
+                    if fl and is_finished(f, output_dir):
+                        continue
+                    digest = file_sha256(f)
+                    t0 = time.time()
+                    res = cached_result(digest, sig[0])
+                    reused = res is not None
+                    if not reused:
+                        res = extract_from_file(f, llm_client=llm_client, ocr_if_empty=ocr_if_empty)
+                    out_path = output_path_for(f, output_dir)
+                    atomic_write_json(out_path, res)
+                    t1 = time.time()
+                    results_by_hash[digest] = res
+                    latency = t1 - first_seen
+                    how = "same content as an earlier document, result reused" if reused else f"extract {t1 - t0:.2f}s"
+                    print(f"[watch] {os.path.basename(f)} -> {out_path} "
+                          f"({how}, end-to-end {latency:.2f}s)")
+                    if on_result:
+                        on_result(f, res, latency)
+                except Exception as e:
+                    print(f"[watch] Failed on {f}: {e}")
+                    if lease:
+                        mark_failed(f, output_dir, worker_id, e)
+                finally:
+                    if fl:
+                        fl.release()
+
+            present = set(files)
+            for f in list(pending):
+                if f not in present:
+                    del pending[f]
+            wait(poll_interval)
+    finally:
+        close()
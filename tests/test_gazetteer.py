@@ -0,0 +1,84 @@
+import json
+import os
+
+from rfp_extractor.gazetteer import Gazetteer, load_gazetteer, validate_entries
+
+
+def names(gz, text):
+    return [(text[s:e], cat, canon) for s, e, cat, canon in gz.find_all(text)]
+
+
+def test_failure_links_find_suffix_patterns():
+    # "she" fails over into "he"; "hers" needs the link from "her" back to the root.
+    gz = Gazetteer({"t": {"HE": ["he corp"], "SHE": ["she corp"], "HERS": ["hers corp"]}})
+    assert names(gz, "ushe corp x") == []
+    assert names(gz, "u she corp x") == [("she corp", "t", "SHE")]
+    gz = Gazetteer({"t": {"AB": ["ab cd"], "BC": ["b cde"]}})
+    assert names(gz, "a b cde") == [("b cde", "t", "BC")]
+
+
+def test_overlapping_aliases_all_reported_longest_first():
+    gz = Gazetteer({"vendor": {"Dell Financial Services LLC": ["Dell Financial Services LLC", "Dell Financial Services"]},
+                    "manufacturer": {"Dell": ["Dell"]}})
+    found = names(gz, "Quote with Dell Financial Services LLC today")
+    assert found == [
+        ("Dell Financial Services LLC", "vendor", "Dell Financial Services LLC"),
+        ("Dell Financial Services", "vendor", "Dell Financial Services LLC"),
+        ("Dell", "manufacturer", "Dell"),
+    ]
+
+
+def test_whitespace_runs_are_folded():
+    gz = Gazetteer({"buyer": {"Dallas ISD": ["Dallas Independent School District"]}})
+    text = "for the Dallas\n  Independent\tSchool   District."
+    assert [c for _, _, _, c in gz.find_all(text)] == ["Dallas ISD"]
+    s, e, _, _ = gz.find_all(text)[0]
+    assert text[s:e].startswith("Dallas") and text[s:e].endswith("District")
+
+
+def test_word_boundaries():
+    gz = Gazetteer({"cooperative": {"Sourcewell": ["Sourcewell"]}, "buyer": {"Austin ISD": ["Austin ISD"]}})
+    assert gz.find_all("XSourcewell") == []
+    assert gz.find_all("Sourcewells") == []
+    assert gz.find_all("austin isd2") == []
+    assert [c for _, _, _, c in gz.find_all("(Sourcewell), austin isd.")] == ["Sourcewell", "Austin ISD"]
+
+
+def test_single_word_aliases_are_case_sensitive():
+    gz = Gazetteer({"cooperative": {"TIPS": ["TIPS-USA", "TIPS Contract"], "NASPO ValuePoint": ["NASPO"]},
+                    "manufacturer": {"Dell": ["Dell"], "Apple": ["Apple Inc."]}})
+    assert gz.find_all("helpful tips, naspo, dell and apple juice") == []
+    assert gz.first("via the tips contract and NASPO", ["cooperative"]) == "TIPS"
+    assert gz.first("Dell laptops", ["manufacturer"]) == "Dell"
+    assert gz.first("We need apple juice", ["manufacturer"]) is None
+
+
+def test_first_respects_category_priority():
+    gz = Gazetteer({"vendor": {"CDW Government LLC": ["CDW"]}, "buyer": {"Houston ISD": ["Houston ISD"]}})
+    text = "CDW quote for Houston ISD"
+    assert gz.first(text, ["buyer", "vendor"]) == "Houston ISD"
+    assert gz.first(text, ["vendor", "buyer"]) == "CDW Government LLC"
+
+
+def test_validate_entries_drops_bad_shapes(capsys):
+    raw = {"buyer": ["Dallas ISD"], "vendor": {"Good": ["Good Co"], "Bad": "Bad Co", "Worse": [1]}}
+    assert validate_entries(raw) == {"vendor": {"Good": ["Good Co"]}}
+    assert "buyer" in capsys.readouterr().out
+    assert validate_entries(["x"]) == {}
+
+
+def test_load_gazetteer_survives_bad_edits(tmp_path):
+    path = str(tmp_path / "gz.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"buyer": {"Austin ISD": ["Austin ISD"]}}, f)
+    assert load_gazetteer(path).first("Austin ISD", ["buyer"]) == "Austin ISD"
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"buyer": {"Austin ISD": ["Austin ISD"]}')
+    os.utime(path, (1, 1))
+    assert load_gazetteer(path).first("Austin ISD", ["buyer"]) == "Austin ISD"
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"buyer": ["Dallas ISD"]}, f)
+    os.utime(path, (2, 2))
+    assert load_gazetteer(path).find_all("Dallas ISD") == []
@@ -0,0 +1,135 @@
+import json
+import multiprocessing as mp
+import os
+import stat
+import time
+
+import pytest
+
+from rfp_extractor import sharding
+from rfp_extractor.sharding import FileLease, atomic_write_json, in_shard, parse_shard
+
+
+def test_parse_shard():
+    assert parse_shard("0/1") == (0, 1)
+    assert parse_shard("3/4") == (3, 4)
+    for bad in ["", "1", "a/b", "4/4", "-1/3", "0/0", "1/2/3"]:
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+
+
+def test_in_shard_partitions_by_basename():
+    files = [f"bid_{i}.pdf" for i in range(200)]
+    owners = [[i for i in range(5) if in_shard(f, i, 5)] for f in files]
+    assert all(len(o) == 1 for o in owners)
+    assert len({o[0] for o in owners}) == 5
+    assert in_shard("/mnt/a/bid_7.pdf", owners[7][0], 5)
+    assert in_shard("/other/mount/bid_7.pdf", owners[7][0], 5)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+def test_atomic_write_json_uses_default_permissions(tmp_path):
+    path = str(tmp_path / "out.json")
+    atomic_write_json(path, {"a": 1})
+    assert json.load(open(path, encoding="utf-8")) == {"a": 1}
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~sharding._UMASK
+    assert os.listdir(tmp_path) == ["out.json"]
+
+
+def test_lease_is_exclusive_and_stale_lease_is_taken_over(tmp_path):
+    a = FileLease(str(tmp_path), "x.pdf", "a", ttl=0.5)
+    b = FileLease(str(tmp_path), "x.pdf", "b", ttl=0.5)
+    assert a.acquire()
+    try:
+        assert not b.acquire()
+        time.sleep(0.7)
+        # a's heartbeat keeps the lease alive past the TTL.
+        assert not b.acquire()
+    finally:
+        a.release()
+    assert b.acquire()
+    b.release()
+
+    dead = FileLease(str(tmp_path), "y.pdf", "dead", ttl=0.3)
+    assert dead._create()
+    c = FileLease(str(tmp_path), "y.pdf", "c", ttl=0.3)
+    assert not c.acquire()
+    time.sleep(0.5)
+    assert c.acquire() and c.owned()
+    c.release()
+    assert os.listdir(tmp_path) == []
+
+
+def test_lease_rejects_non_positive_ttl(tmp_path):
+    for ttl in (0, -1.0):
+        with pytest.raises(ValueError):
+            FileLease(str(tmp_path), "x.pdf", "a", ttl=ttl)
+
+
+def test_stale_steal_lock_is_broken_but_fresh_one_is_respected(tmp_path):
+    dead = FileLease(str(tmp_path), "z.pdf", "dead", ttl=0.3)
+    assert dead._create()
+    assert dead._create(dead.path + ".steal")
+    old = time.time() - 10
+    os.utime(dead.path, (old, old))
+    os.utime(dead.path + ".steal", (old, old))
+    c = FileLease(str(tmp_path), "z.pdf", "c", ttl=0.3)
+    assert c.acquire() and c.owned()
+    c.release()
+
+    assert dead._create()
+    os.utime(dead.path, (old, old))
+    assert dead._create(dead.path + ".steal")
+    d = FileLease(str(tmp_path), "z.pdf", "d", ttl=0.3)
+    assert not d.acquire()
+    assert os.path.exists(dead.path + ".steal")
+
+
+def _worker(input_dir, output_dir, log_path, worker_id, ttl, crash):
+    from rfp_extractor import extractor
+
+    def fake_extract(path, **kwargs):
+        if crash:
+            os._exit(1)
+        time.sleep(0.02)
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(f"{worker_id}\t{os.path.basename(path)}\n")
+        return {"worker": worker_id}
+
+    extractor.extract_from_file = fake_extract
+    extractor.batch_extract(input_dir, output_dir, lease=True, lease_ttl=ttl, worker_id=worker_id)
+
+
+def test_lease_workers_extract_each_file_once_and_recover_crashes(tmp_path):
+    input_dir, output_dir = str(tmp_path / "in"), str(tmp_path / "out")
+    os.makedirs(input_dir)
+    names = [f"doc{i}.txt" for i in range(24)]
+    for n in names:
+        with open(os.path.join(input_dir, n), "w", encoding="utf-8") as f:
+            f.write(n)
+    log_path = str(tmp_path / "log.tsv")
+    ctx = mp.get_context("spawn")
+    ttl = 1.0
+
+    crasher = ctx.Process(target=_worker, args=(input_dir, output_dir, log_path, "crasher", ttl, True))
+    crasher.start()
+    crasher.join(30)
+    assert crasher.exitcode == 1
+    leases = [p for p in os.listdir(os.path.join(output_dir, ".leases")) if p.endswith(".lease")]
+    assert len(leases) == 1
+
+    start = time.time()
+    workers = [ctx.Process(target=_worker, args=(input_dir, output_dir, log_path, f"w{i}", ttl, False))
+               for i in range(4)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join(60)
+        assert p.exitcode == 0
+
+    with open(log_path, encoding="utf-8") as f:
+        done = [line.rstrip("\n").split("\t")[1] for line in f]
+    assert sorted(done) == sorted(names)
+    assert time.time() - start >= ttl
+    assert sorted(os.listdir(output_dir)) == sorted([".leases"] + [n[:-4] + ".json" for n in names])
+    assert os.listdir(os.path.join(output_dir, ".leases")) == []
@@ -0,0 +1,18 @@
+from rfp_extractor.utils import extract_contact_and_company, rule_based_extract
+
+
+def test_brand_names_are_not_companies():
+    assert extract_contact_and_company("Contact: Acme Corp ... We need apple juice")["company_name"] == "Acme Corp"
+    assert extract_contact_and_company("Dell Latitude laptops with HP monitors")["company_name"] is None
+
+
+def test_known_buyer_wins_and_vendor_trims_regex_match():
+    assert extract_contact_and_company("Dallas\nIndependent School District RFP")["company_name"] == "Dallas ISD"
+    text = "services on this Quote with Dell Financial Services LLC"
+    assert extract_contact_and_company(text)["company_name"] == "Dell Financial Services LLC"
+
+
+def test_manufacturer_and_cooperative_fields():
+    out = rule_based_extract("Quote for Dell Latitude 5550 devices via Sourcewell\n")
+    assert out["mfg_for_registration"] == "Dell"
+    assert out["contract_or_cooperative_to_use"] == "Sourcewell"
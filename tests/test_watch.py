@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from rfp_extractor import watch
+from rfp_extractor.sharding import in_shard
+
+
+def _run(monkeypatch, tmp_path, extract, **kwargs):
+    input_dir, output_dir = str(tmp_path / "in"), str(tmp_path / "out")
+    os.makedirs(input_dir, exist_ok=True)
+    monkeypatch.setattr(watch, "extract_from_file", extract)
+    stop = threading.Event()
+    results = {}
+    t = threading.Thread(target=watch.watch_extract, args=(input_dir, output_dir),
+                         kwargs=dict(poll_interval=0.05, settle=0.3, stop_event=stop,
+                                     on_result=lambda p, r, l: results.setdefault(os.path.basename(p), l),
+                                     **kwargs))
+    t.start()
+    return input_dir, output_dir, stop, t, results
+
+
+def test_watch_debounces_and_dedupes(monkeypatch, tmp_path):
+    calls = []
+
+    def extract(path, **kwargs):
+        calls.append((os.path.basename(path), open(path, encoding="utf-8").read()))
+        return {"ok": True}
+
+    input_dir, output_dir, stop, t, results = _run(monkeypatch, tmp_path, extract)
+    try:
+        with open(os.path.join(input_dir, "a.txt"), "w", encoding="utf-8") as f:
+            f.write("part")
+            f.flush()
+            time.sleep(0.2)
+            f.write(" two")
+        time.sleep(0.1)
+        with open(os.path.join(input_dir, "copy.txt"), "w", encoding="utf-8") as f:
+            f.write("part two")
+        time.sleep(1.0)
+    finally:
+        stop.set()
+        t.join(5)
+    # copy.txt is not extracted again but still gets its own output and callback.
+    assert calls == [("a.txt", "part two")]
+    assert set(results) == {"a.txt", "copy.txt"}
+    assert results["a.txt"] >= 0.3
+    assert sorted(os.listdir(output_dir)) == ["a.json", "copy.json"]
+
+
+def _write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_watch_reverted_content_restores_matching_result(monkeypatch, tmp_path):
+    def extract(path, **kwargs):
+        return {"content": open(path, encoding="utf-8").read()}
+
+    input_dir, output_dir, stop, t, _ = _run(monkeypatch, tmp_path, extract)
+    a = os.path.join(input_dir, "a.txt")
+    try:
+        for text in ("X", "Y", "X"):
+            _write(a, text)
+            time.sleep(0.6)
+    finally:
+        stop.set()
+        t.join(5)
+    assert json.load(open(os.path.join(output_dir, "a.json"), encoding="utf-8")) == {"content": "X"}
+
+
+def test_watch_startup_hashes_lazily_and_respects_shard(monkeypatch, tmp_path):
+    input_dir, output_dir = str(tmp_path / "in"), str(tmp_path / "out")
+    os.makedirs(input_dir)
+    os.makedirs(output_dir)
+    names = [f"old{i}.txt" for i in range(20)]
+    for n in names:
+        _write(os.path.join(input_dir, n), "same size " + n[-6:])
+        _write(os.path.join(output_dir, n[:-4] + ".json"), json.dumps({"from": n}))
+    hashed = []
+    real_hash = watch.file_sha256
+    monkeypatch.setattr(watch, "file_sha256", lambda p: hashed.append(os.path.basename(p)) or real_hash(p))
+    calls = []
+
+    def extract(path, **kwargs):
+        calls.append(os.path.basename(path))
+        return {}
+
+    mine = [n for n in names if in_shard(n, 0, 2)]
+    _, _, stop, t, _ = _run(monkeypatch, tmp_path, extract, shard=(0, 2))
+    try:
+        time.sleep(0.3)
+        assert hashed == []
+        _write(os.path.join(input_dir, "new.txt"), "a different, longer body")
+        time.sleep(0.6)
+    finally:
+        stop.set()
+        t.join(5)
+    # No startup file shares new.txt's size, so none of them is ever hashed.
+    assert [h for h in hashed if h != "new.txt"] == []
+    assert calls == (["new.txt"] if in_shard("new.txt", 0, 2) else [])
+
+    # A copy of an already-extracted file in this shard reuses its output.
+    dup = next(n for n in ["dup%d.txt" % i for i in range(50)] if in_shard(n, 0, 2))
+    calls.clear()
+    _, _, stop, t, _ = _run(monkeypatch, tmp_path, extract, shard=(0, 2))
+    try:
+        time.sleep(0.2)
+        _write(os.path.join(input_dir, dup), open(os.path.join(input_dir, mine[0]), encoding="utf-8").read())
+        time.sleep(0.6)
+    finally:
+        stop.set()
+        t.join(5)
+    assert calls == []
+    assert json.load(open(os.path.join(output_dir, dup[:-4] + ".json"), encoding="utf-8")) == {"from": mine[0]}
+    assert hashed and all(in_shard(h, 0, 2) for h in hashed)
+
+
+def test_watch_rejects_non_positive_intervals(tmp_path):
+    for kwargs in ({"poll_interval": 0}, {"settle": -1}, {"lease": True, "lease_ttl": 0}):
+        with pytest.raises(ValueError):
+            watch.watch_extract(str(tmp_path), str(tmp_path / "out"), **kwargs)
+
+
+def test_watch_lease_mode_skips_finished_and_marks_failures(monkeypatch, tmp_path):
+    calls = []
+
+    def extract(path, **kwargs):
+        calls.append(os.path.basename(path))
+        raise RuntimeError("boom")
+
+    input_dir, output_dir = str(tmp_path / "in"), str(tmp_path / "out")
+    os.makedirs(input_dir)
+    os.makedirs(output_dir)
+    with open(os.path.join(input_dir, "done.txt"), "w", encoding="utf-8") as f:
+        f.write("done")
+    with open(os.path.join(output_dir, "done.json"), "w", encoding="utf-8") as f:
+        f.write("{}")
+    with open(os.path.join(input_dir, "bad.txt"), "w", encoding="utf-8") as f:
+        f.write("bad")
+
+    _, _, stop, t, _ = _run(monkeypatch, tmp_path, extract, lease=True, lease_ttl=5.0)
+    try:
+        time.sleep(0.8)
+    finally:
+        stop.set()
+        t.join(5)
+    assert calls == ["bad.txt"]
+    leases = sorted(os.listdir(os.path.join(output_dir, ".leases")))
+    assert leases == ["bad.txt.failed"]
+
+    # A second watcher on the same folder must not retry the failed file.
+    calls.clear()
+    _, _, stop, t, _ = _run(monkeypatch, tmp_path, extract, lease=True, lease_ttl=5.0)
+    try:
+        time.sleep(0.6)
+    finally:
+        stop.set()
+        t.join(5)
+    assert calls == []